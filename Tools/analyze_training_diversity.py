@@ -4,19 +4,214 @@ Analyze diversity and quality of ability training data.
 Provides metrics to assess if dataset is sufficient for training.
 """
 
+import hashlib
+import heapq
 import json
 import math
+import mmap
+import operator
+import sys
+from array import array
 from pathlib import Path
 from collections import Counter, defaultdict
-from typing import List, Dict, Any
+from functools import cached_property
+from typing import List, Dict, Any, Final, Union
+
+# Scoring constants
+MAX_ELEMENT_PAIRS: Final = 28  # With 8 elements, there are C(8,2) = 28 possible pairs
+MAX_COMPLEXITY_LEVELS_LOG2: Final = math.log2(5)  # Assume 5 reasonable complexity levels
+MAX_STATUSES: Final = 10  # Assume 10 possible statuses
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib parser
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # Optional: fall back to pure-Python reductions
+    np = None
+
+def load_json_file(path):
+    """Load a JSON file, parsing straight from a memory map when orjson is available."""
+    if orjson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+# Shared read-only default for missing 'args', so lookups on nodes without args
+# don't allocate a fresh empty dict each time. Never mutate it.
+_EMPTY = {}
+
+def _collect_damage(script_item, acc):
+    acc['damage_values'].append(script_item.get('args', _EMPTY).get('amount', 0))
+
+def _collect_status(script_item, acc):
+    args = script_item.get('args', _EMPTY)
+    acc['statuses'][args.get('status', 'unknown')] += 1
+    acc['duration_values'].append(args.get('duration', 0))
+
+# Per-action handlers applied to every script node, including nested on_hit nodes
+_ACTION_HANDLERS = {
+    'damage': _collect_damage,
+    'apply_status': _collect_status,
+}
+
+def _visit_script(script_item, acc):
+    """Apply action handlers to a script node and its on_hit chain, returning the max depth.
+
+    Uses an explicit stack of (node, depth) pairs so deep chains don't pay per-node
+    call overhead or hit the recursion limit. Children are pushed in reverse to keep
+    the same pre-order visit as a recursive walk.
+    """
+    max_d = 0
+    stack = [(script_item, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if depth > max_d:
+            max_d = depth
+
+        handler = _ACTION_HANDLERS.get(node.get('action'))
+        if handler:
+            handler(node, acc)
+
+        on_hit = node.get('on_hit')
+        if on_hit:
+            stack.extend((child, depth + 1) for child in reversed(on_hit))
+    return max_d
+
+def _new_accumulators(n):
+    """Create empty accumulators, with per-entry arrays preallocated for n entries."""
+    # Counts use defaultdict(int) rather than Counter: `d[k] += 1` skips Counter's
+    # __missing__ path and is noticeably cheaper in the hot loop. Per-entry values
+    # live in typed arrays (machine ints/doubles rather than boxed Python objects).
+    return {
+        'combos': defaultdict(int),
+        'actions': defaultdict(int),
+        'sequence_counts': defaultdict(int),
+        'shapes': defaultdict(int),
+        'movements': defaultdict(int),
+        'shape_movement_combos': defaultdict(int),
+        'statuses': defaultdict(int),
+        'script_lengths': array('i', [0]) * n,
+        'nested_depths': array('i', [0]) * n,
+        'damage_values': array('d'),
+        'duration_values': array('d'),
+        'cooldown_values': array('d', [0.0]) * n,
+    }
+
+def _structural_key(script):
+    """Hash a script subtree by content, so equal subtrees share a key across entries.
+
+    Returns None when orjson isn't installed (hashing via json.dumps costs more than
+    re-walking the script) or when the script isn't orjson-serializable, e.g. ints
+    beyond 64 bits or non-JSON values in programmatic data.
+    """
+    if orjson is None:
+        return None
+    try:
+        payload = orjson.dumps(script, option=orjson.OPT_SORT_KEYS)
+    except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+        return None
+    return hashlib.blake2b(payload, digest_size=8).digest()
+
+# Cache marker for a script key seen once; its summary is only built on a repeat
+_SEEN_ONCE = object()
+
+def _walk_script(script, acc, cache):
+    """Walk a top-level script into acc and return its max depth.
+
+    Unique scripts (the common case) are walked straight into acc. Only when a
+    script's key turns up again is a standalone (max_depth, statuses, damage_values,
+    duration_values) summary built and cached, so further repeats merge it instead
+    of re-walking. The key is the structural hash when available, so identical copies
+    match, and id() otherwise, so shared dicts still do.
+    """
+    key = _structural_key(script)
+    if key is None:
+        key = id(script)
+
+    summary = cache.get(key)
+    if summary is None:
+        cache[key] = _SEEN_ONCE
+        return _visit_script(script, acc)
+    if summary is _SEEN_ONCE:
+        sub = {'statuses': defaultdict(int), 'damage_values': array('d'), 'duration_values': array('d')}
+        depth = _visit_script(script, sub)
+        summary = (depth, sub['statuses'], sub['damage_values'], sub['duration_values'])
+        cache[key] = summary
+
+    depth, statuses, damage, durations = summary
+    acc_statuses = acc['statuses']
+    for status, count in statuses.items():
+        acc_statuses[status] += count
+    acc['damage_values'].extend(damage)
+    acc['duration_values'].extend(durations)
+    return depth
+
+def _process_entries(entries, prim_keys, script_cache):
+    """Walk a batch of entries (with their element-combination keys) and return its accumulators."""
+    acc = _new_accumulators(len(entries))
+
+    for i, entry in enumerate(entries):
+        ability = entry['ability']
+        acc['combos'][prim_keys[i]] += 1
+        acc['cooldown_values'][i] = ability.get('cooldown', 0)
+
+        sequence = []
+        total_scripts = 0
+        max_depth = 0
+
+        for effect in ability['effects']:
+            for script in effect['script']:
+                total_scripts += 1
+                action = script.get('action', 'unknown')
+                acc['actions'][action] += 1
+                sequence.append(action)
+
+                if action == 'spawn_melee':
+                    args = script.get('args', _EMPTY)
+                    shape = args.get('shape', 'unknown')
+                    movement = args.get('movement', 'stationary')
+
+                    acc['shapes'][shape] += 1
+                    acc['movements'][movement] += 1
+                    acc['shape_movement_combos'][(shape, movement)] += 1
+
+                max_depth = max(max_depth, _walk_script(script, acc, script_cache))
+
+        acc['sequence_counts'][tuple(sequence)] += 1
+        acc['script_lengths'][i] = total_scripts
+        acc['nested_depths'][i] = max_depth
+
+    return acc
 
 class DiversityAnalyzer:
     def __init__(self, data: List[Dict[str, Any]]):
         self.data = data
         self.n = len(data)
+        # Sorted primitive pair used as the element-combination key, computed once per
+        # entry and kept on the analyzer rather than written into the caller's dicts
+        self._prim_keys = [tuple(sorted(entry['ability']['primitives'])) for entry in data]
+        # Repeated-script summaries for the walk (see _walk_script)
+        self._script_cache: Dict[Union[int, bytes], Any] = {}
 
-    def shannon_entropy(self, counts: Counter) -> float:
+    def shannon_entropy(self, counts: Dict[Any, int]) -> float:
         """Calculate Shannon entropy for distribution."""
+        if np is not None:
+            v = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            total = v.sum()
+            if total == 0:
+                return 0.0
+            p = v / total
+            # Empty bins contribute 0 (log2 is only evaluated where p > 0)
+            log_p = np.log2(p, where=p > 0, out=np.zeros_like(p))
+            # 0.0 - x rather than -x so a single-bin distribution yields 0.0, not -0.0
+            return float(0.0 - np.einsum('i,i->', p, log_p))
+
         total = sum(counts.values())
         if total == 0:
             return 0.0
@@ -28,26 +223,40 @@ class DiversityAnalyzer:
                 entropy -= p * math.log2(p)
         return entropy
 
-    def analyze_element_combinations(self):
+    def _entropy_and_evenness(self, counts):
+        """Return (entropy, max_entropy, evenness_percent) for a distribution.
+
+        With fewer than two bins evenness is undefined, so skip the log2 and division.
+        """
+        if len(counts) < 2:
+            return 0.0, 0, 0
+        entropy = self.shannon_entropy(counts)
+        max_entropy = math.log2(len(counts))
+        return entropy, max_entropy, entropy / max_entropy * 100
+
+    def _walk(self):
+        """Traverse every ability once, filling all accumulators used by the analyses."""
+        return _process_entries(self.data, self._prim_keys, self._script_cache)
+
+    @cached_property
+    def _collected(self):
+        """Accumulators from the single traversal, computed on first use."""
+        return self._walk()
+
+    @cached_property
+    def elements(self):
         """Analyze element pair diversity."""
-        combos = Counter()
-        for entry in self.data:
-            prims = tuple(sorted(entry['ability']['primitives']))
-            combos[prims] += 1
+        combos = self._collected['combos']
 
         # Calculate coverage (how many possible combinations are present)
-        # With 8 elements, there are C(8,2) = 28 possible pairs
-        max_possible = 28
-        coverage = len(combos) / max_possible * 100
+        coverage = len(combos) / MAX_ELEMENT_PAIRS * 100
 
         # Calculate entropy (evenness of distribution)
-        entropy = self.shannon_entropy(combos)
-        max_entropy = math.log2(len(combos)) if combos else 0
-        evenness = (entropy / max_entropy * 100) if max_entropy > 0 else 0
+        entropy, max_entropy, evenness = self._entropy_and_evenness(combos)
 
         return {
             'unique_combinations': len(combos),
-            'max_possible': max_possible,
+            'max_possible': MAX_ELEMENT_PAIRS,
             'coverage_percent': coverage,
             'distribution': dict(combos),
             'entropy': entropy,
@@ -58,50 +267,34 @@ class DiversityAnalyzer:
             'avg_samples': sum(combos.values()) / len(combos) if combos else 0
         }
 
-    def analyze_actions(self):
+    @cached_property
+    def actions(self):
         """Analyze action type diversity."""
-        actions = Counter()
-        action_sequences = []
-
-        for entry in self.data:
-            sequence = []
-            for effect in entry['ability']['effects']:
-                for script in effect['script']:
-                    action = script.get('action', 'unknown')
-                    actions[action] += 1
-                    sequence.append(action)
-            action_sequences.append(tuple(sequence))
+        actions = self._collected['actions']
+        sequence_counts = self._collected['sequence_counts']
 
         # Sequence diversity
-        unique_sequences = len(set(action_sequences))
-        sequence_entropy = self.shannon_entropy(Counter(action_sequences))
+        unique_sequences = len(sequence_counts)
+        sequence_entropy = self.shannon_entropy(sequence_counts)
+        entropy, max_entropy, evenness = self._entropy_and_evenness(actions)
 
         return {
             'action_distribution': dict(actions),
             'unique_actions': len(actions),
-            'entropy': self.shannon_entropy(actions),
+            'entropy': entropy,
+            'max_entropy': max_entropy,
+            'evenness_percent': evenness,
             'unique_sequences': unique_sequences,
             'sequence_entropy': sequence_entropy,
             'sequence_diversity_percent': unique_sequences / self.n * 100
         }
 
-    def analyze_melee_attacks(self):
+    @cached_property
+    def melee_attacks(self):
         """Analyze melee attack diversity."""
-        shapes = Counter()
-        movements = Counter()
-        shape_movement_combos = Counter()
-
-        for entry in self.data:
-            for effect in entry['ability']['effects']:
-                for script in effect['script']:
-                    if script.get('action') == 'spawn_melee':
-                        args = script.get('args', {})
-                        shape = args.get('shape', 'unknown')
-                        movement = args.get('movement', 'stationary')
-
-                        shapes[shape] += 1
-                        movements[movement] += 1
-                        shape_movement_combos[(shape, movement)] += 1
+        shapes = self._collected['shapes']
+        movements = self._collected['movements']
+        shape_movement_combos = self._collected['shape_movement_combos']
 
         if not shapes:
             return None
@@ -114,50 +307,25 @@ class DiversityAnalyzer:
             'movement_entropy': self.shannon_entropy(movements)
         }
 
-    def analyze_status_effects(self):
+    @cached_property
+    def status_effects(self):
         """Analyze status effect diversity."""
-        statuses = Counter()
-
-        def extract_statuses(script_item):
-            if script_item.get('action') == 'apply_status':
-                status = script_item.get('args', {}).get('status', 'unknown')
-                statuses[status] += 1
-            for on_hit in script_item.get('on_hit', []):
-                extract_statuses(on_hit)
-
-        for entry in self.data:
-            for effect in entry['ability']['effects']:
-                for script in effect['script']:
-                    extract_statuses(script)
+        statuses = self._collected['statuses']
+        entropy, max_entropy, evenness = self._entropy_and_evenness(statuses)
 
         return {
             'distribution': dict(statuses),
             'unique_statuses': len(statuses),
-            'entropy': self.shannon_entropy(statuses)
+            'entropy': entropy,
+            'max_entropy': max_entropy,
+            'evenness_percent': evenness
         }
 
-    def analyze_complexity(self):
+    @cached_property
+    def complexity(self):
         """Analyze ability complexity."""
-        script_lengths = []
-        nested_depths = []
-
-        def get_max_depth(script_item, depth=0):
-            max_d = depth
-            for on_hit in script_item.get('on_hit', []):
-                max_d = max(max_d, get_max_depth(on_hit, depth + 1))
-            return max_d
-
-        for entry in self.data:
-            total_scripts = 0
-            max_depth = 0
-
-            for effect in entry['ability']['effects']:
-                for script in effect['script']:
-                    total_scripts += 1
-                    max_depth = max(max_depth, get_max_depth(script))
-
-            script_lengths.append(total_scripts)
-            nested_depths.append(max_depth)
+        script_lengths = self._collected['script_lengths']
+        nested_depths = self._collected['nested_depths']
 
         return {
             'avg_scripts_per_ability': sum(script_lengths) / len(script_lengths),
@@ -168,30 +336,27 @@ class DiversityAnalyzer:
             'complexity_entropy': self.shannon_entropy(Counter(script_lengths))
         }
 
-    def analyze_parameters(self):
+    @cached_property
+    def parameters(self):
         """Analyze parameter value diversity."""
-        damage_values = []
-        duration_values = []
-        cooldown_values = []
-
-        def extract_values(script_item):
-            if script_item.get('action') == 'damage':
-                damage_values.append(script_item.get('args', {}).get('amount', 0))
-            if script_item.get('action') == 'apply_status':
-                duration_values.append(script_item.get('args', {}).get('duration', 0))
-            for on_hit in script_item.get('on_hit', []):
-                extract_values(on_hit)
-
-        for entry in self.data:
-            cooldown_values.append(entry['ability'].get('cooldown', 0))
-
-            for effect in entry['ability']['effects']:
-                for script in effect['script']:
-                    extract_values(script)
+        damage_values = self._collected['damage_values']
+        duration_values = self._collected['duration_values']
+        cooldown_values = self._collected['cooldown_values']
 
         def value_stats(values, name):
             if not values:
                 return None
+            if np is not None:
+                a = np.frombuffer(values, dtype=np.float64)
+                uniques, counts = np.unique(a, return_counts=True)
+                p = counts / counts.sum()
+                return {
+                    'min': float(a.min()),
+                    'max': float(a.max()),
+                    'avg': float(a.mean()),
+                    'unique_values': int(uniques.size),
+                    'entropy': float(0.0 - (p * np.log2(p)).sum())
+                }
             return {
                 'min': min(values),
                 'max': max(values),
@@ -206,8 +371,34 @@ class DiversityAnalyzer:
             'cooldown': value_stats(cooldown_values, 'cooldown')
         }
 
-    def calculate_overall_diversity_score(self, analyses):
+    # Method forms kept for existing callers; each returns the cached analysis above
+    def analyze_element_combinations(self):
+        return self.elements
+
+    def analyze_actions(self):
+        return self.actions
+
+    def analyze_melee_attacks(self):
+        return self.melee_attacks
+
+    def analyze_status_effects(self):
+        return self.status_effects
+
+    def analyze_complexity(self):
+        return self.complexity
+
+    def analyze_parameters(self):
+        return self.parameters
+
+    def calculate_overall_diversity_score(self, analyses=None):
         """Calculate overall diversity score (0-100)."""
+        if analyses is None:
+            analyses = {
+                'elements': self.elements,
+                'actions': self.actions,
+                'status_effects': self.status_effects,
+                'complexity': self.complexity
+            }
         scores = []
 
         # Element coverage (0-100)
@@ -220,118 +411,119 @@ class DiversityAnalyzer:
         scores.append(analyses['actions']['sequence_diversity_percent'])
 
         # Complexity variety (normalized entropy)
-        max_complexity_entropy = math.log2(5)  # Assume 5 reasonable complexity levels
-        complexity_score = (analyses['complexity']['complexity_entropy'] / max_complexity_entropy * 100)
+        complexity_score = (analyses['complexity']['complexity_entropy'] / MAX_COMPLEXITY_LEVELS_LOG2 * 100)
         scores.append(min(complexity_score, 100))
 
-        # Status effect variety (assume 10 possible statuses)
-        status_coverage = (analyses['status_effects']['unique_statuses'] / 10 * 100)
+        # Status effect variety
+        status_coverage = (analyses['status_effects']['unique_statuses'] / MAX_STATUSES * 100)
         scores.append(min(status_coverage, 100))
 
         return sum(scores) / len(scores)
 
     def generate_report(self):
         """Generate comprehensive diversity report."""
-        print("=" * 80)
-        print("ABILITY TRAINING DATA DIVERSITY ANALYSIS")
-        print("=" * 80)
-        print(f"Total Entries: {self.n}\n")
+        # Collect lines and emit them in one write instead of locking/flushing stdout per line
+        out = []
+        out.append("=" * 80)
+        out.append("ABILITY TRAINING DATA DIVERSITY ANALYSIS")
+        out.append("=" * 80)
+        out.append(f"Total Entries: {self.n}\n")
 
         # Element combinations
-        elem_analysis = self.analyze_element_combinations()
-        print("─" * 80)
-        print("1. ELEMENT COMBINATIONS")
-        print("─" * 80)
-        print(f"Unique combinations: {elem_analysis['unique_combinations']}/{elem_analysis['max_possible']}")
-        print(f"Coverage: {elem_analysis['coverage_percent']:.1f}%")
-        print(f"Samples per combo: {elem_analysis['min_samples']}-{elem_analysis['max_samples']} (avg: {elem_analysis['avg_samples']:.1f})")
-        print(f"Distribution evenness: {elem_analysis['evenness_percent']:.1f}% (100% = perfectly balanced)")
-        print(f"Entropy: {elem_analysis['entropy']:.2f} bits (max: {elem_analysis['max_entropy']:.2f})")
+        elem_analysis = self.elements
+        out.append("─" * 80)
+        out.append("1. ELEMENT COMBINATIONS")
+        out.append("─" * 80)
+        out.append(f"Unique combinations: {elem_analysis['unique_combinations']}/{elem_analysis['max_possible']}")
+        out.append(f"Coverage: {elem_analysis['coverage_percent']:.1f}%")
+        out.append(f"Samples per combo: {elem_analysis['min_samples']}-{elem_analysis['max_samples']} (avg: {elem_analysis['avg_samples']:.1f})")
+        out.append(f"Distribution evenness: {elem_analysis['evenness_percent']:.1f}% (100% = perfectly balanced)")
+        out.append(f"Entropy: {elem_analysis['entropy']:.2f} bits (max: {elem_analysis['max_entropy']:.2f})")
 
         # Show top/bottom combinations
-        sorted_combos = sorted(elem_analysis['distribution'].items(), key=lambda x: x[1], reverse=True)
-        print(f"\nTop 5 combinations:")
-        for combo, count in sorted_combos[:5]:
-            print(f"  {count:3d}  {combo[0]:<10} + {combo[1]}")
-        print(f"\nBottom 5 combinations:")
-        for combo, count in sorted_combos[-5:]:
-            print(f"  {count:3d}  {combo[0]:<10} + {combo[1]}")
+        # Only the ends are shown, so pick them with heapq rather than sorting every combo.
+        # Bottom 5 scans the items in reverse so ties keep the same order a full
+        # descending sort would give.
+        by_count = operator.itemgetter(1)
+        combo_items = elem_analysis['distribution'].items()
+        top_combos = heapq.nlargest(5, combo_items, key=by_count)
+        bottom_combos = heapq.nsmallest(5, reversed(combo_items), key=by_count)[::-1]
+        out.append(f"\nTop 5 combinations:")
+        for combo, count in top_combos:
+            out.append(f"  {count:3d}  {combo[0]:<10} + {combo[1]}")
+        out.append(f"\nBottom 5 combinations:")
+        for combo, count in bottom_combos:
+            out.append(f"  {count:3d}  {combo[0]:<10} + {combo[1]}")
 
         # Actions
-        action_analysis = self.analyze_actions()
-        print("\n" + "─" * 80)
-        print("2. ACTION TYPES")
-        print("─" * 80)
-        print(f"Unique actions: {action_analysis['unique_actions']}")
-        print(f"Action entropy: {action_analysis['entropy']:.2f} bits")
-        print(f"Unique action sequences: {action_analysis['unique_sequences']} ({action_analysis['sequence_diversity_percent']:.1f}%)")
-        print(f"Sequence entropy: {action_analysis['sequence_entropy']:.2f} bits")
+        action_analysis = self.actions
+        out.append("\n" + "─" * 80)
+        out.append("2. ACTION TYPES")
+        out.append("─" * 80)
+        out.append(f"Unique actions: {action_analysis['unique_actions']}")
+        out.append(f"Action entropy: {action_analysis['entropy']:.2f} bits")
+        out.append(f"Unique action sequences: {action_analysis['unique_sequences']} ({action_analysis['sequence_diversity_percent']:.1f}%)")
+        out.append(f"Sequence entropy: {action_analysis['sequence_entropy']:.2f} bits")
 
         total_actions = sum(action_analysis['action_distribution'].values())
-        print(f"\nAction distribution:")
-        for action, count in sorted(action_analysis['action_distribution'].items(), key=lambda x: x[1], reverse=True):
+        out.append(f"\nAction distribution:")
+        for action, count in sorted(action_analysis['action_distribution'].items(), key=by_count, reverse=True):
             pct = count / total_actions * 100
-            print(f"  {count:3d} ({pct:5.1f}%)  {action}")
+            out.append(f"  {count:3d} ({pct:5.1f}%)  {action}")
 
         # Melee attacks
-        melee_analysis = self.analyze_melee_attacks()
+        melee_analysis = self.melee_attacks
         if melee_analysis:
-            print("\n" + "─" * 80)
-            print("3. MELEE ATTACKS")
-            print("─" * 80)
-            print(f"Shapes: {len(melee_analysis['shapes'])} (entropy: {melee_analysis['shape_entropy']:.2f})")
+            out.append("\n" + "─" * 80)
+            out.append("3. MELEE ATTACKS")
+            out.append("─" * 80)
+            out.append(f"Shapes: {len(melee_analysis['shapes'])} (entropy: {melee_analysis['shape_entropy']:.2f})")
             for shape, count in melee_analysis['shapes'].items():
-                print(f"  {count:3d}  {shape}")
+                out.append(f"  {count:3d}  {shape}")
 
-            print(f"\nMovements: {len(melee_analysis['movements'])} (entropy: {melee_analysis['movement_entropy']:.2f})")
+            out.append(f"\nMovements: {len(melee_analysis['movements'])} (entropy: {melee_analysis['movement_entropy']:.2f})")
             for movement, count in melee_analysis['movements'].items():
-                print(f"  {count:3d}  {movement}")
+                out.append(f"  {count:3d}  {movement}")
 
         # Status effects
-        status_analysis = self.analyze_status_effects()
-        print("\n" + "─" * 80)
-        print("4. STATUS EFFECTS")
-        print("─" * 80)
-        print(f"Unique statuses: {status_analysis['unique_statuses']}")
-        print(f"Entropy: {status_analysis['entropy']:.2f} bits")
-        for status, count in sorted(status_analysis['distribution'].items(), key=lambda x: x[1], reverse=True):
-            print(f"  {count:3d}  {status}")
+        status_analysis = self.status_effects
+        out.append("\n" + "─" * 80)
+        out.append("4. STATUS EFFECTS")
+        out.append("─" * 80)
+        out.append(f"Unique statuses: {status_analysis['unique_statuses']}")
+        out.append(f"Entropy: {status_analysis['entropy']:.2f} bits")
+        for status, count in sorted(status_analysis['distribution'].items(), key=by_count, reverse=True):
+            out.append(f"  {count:3d}  {status}")
 
         # Complexity
-        complexity_analysis = self.analyze_complexity()
-        print("\n" + "─" * 80)
-        print("5. ABILITY COMPLEXITY")
-        print("─" * 80)
-        print(f"Scripts per ability: {complexity_analysis['min_scripts']}-{complexity_analysis['max_scripts']} (avg: {complexity_analysis['avg_scripts_per_ability']:.1f})")
-        print(f"Nesting depth: 0-{complexity_analysis['max_nesting_depth']} (avg: {complexity_analysis['avg_nesting_depth']:.1f})")
-        print(f"Complexity entropy: {complexity_analysis['complexity_entropy']:.2f} bits")
+        complexity_analysis = self.complexity
+        out.append("\n" + "─" * 80)
+        out.append("5. ABILITY COMPLEXITY")
+        out.append("─" * 80)
+        out.append(f"Scripts per ability: {complexity_analysis['min_scripts']}-{complexity_analysis['max_scripts']} (avg: {complexity_analysis['avg_scripts_per_ability']:.1f})")
+        out.append(f"Nesting depth: 0-{complexity_analysis['max_nesting_depth']} (avg: {complexity_analysis['avg_nesting_depth']:.1f})")
+        out.append(f"Complexity entropy: {complexity_analysis['complexity_entropy']:.2f} bits")
 
         # Parameters
-        param_analysis = self.analyze_parameters()
-        print("\n" + "─" * 80)
-        print("6. PARAMETER VALUES")
-        print("─" * 80)
+        param_analysis = self.parameters
+        out.append("\n" + "─" * 80)
+        out.append("6. PARAMETER VALUES")
+        out.append("─" * 80)
 
         for param_name, stats in param_analysis.items():
             if stats:
-                print(f"{param_name.upper()}:")
-                print(f"  Range: {stats['min']:.1f} - {stats['max']:.1f} (avg: {stats['avg']:.1f})")
-                print(f"  Unique values: {stats['unique_values']}")
-                print(f"  Entropy: {stats['entropy']:.2f} bits")
+                out.append(f"{param_name.upper()}:")
+                out.append(f"  Range: {stats['min']:.1f} - {stats['max']:.1f} (avg: {stats['avg']:.1f})")
+                out.append(f"  Unique values: {stats['unique_values']}")
+                out.append(f"  Entropy: {stats['entropy']:.2f} bits")
 
         # Overall score
-        analyses = {
-            'elements': elem_analysis,
-            'actions': action_analysis,
-            'status_effects': status_analysis,
-            'complexity': complexity_analysis
-        }
-        overall_score = self.calculate_overall_diversity_score(analyses)
+        overall_score = self.calculate_overall_diversity_score()
 
-        print("\n" + "=" * 80)
-        print("OVERALL DIVERSITY SCORE")
-        print("=" * 80)
-        print(f"Score: {overall_score:.1f}/100")
+        out.append("\n" + "=" * 80)
+        out.append("OVERALL DIVERSITY SCORE")
+        out.append("=" * 80)
+        out.append(f"Score: {overall_score:.1f}/100")
 
         if overall_score >= 80:
             verdict = "✅ EXCELLENT - High diversity"
@@ -342,35 +534,37 @@ class DiversityAnalyzer:
         else:
             verdict = "❌ LOW - Needs significant expansion"
 
-        print(f"Verdict: {verdict}")
+        out.append(f"Verdict: {verdict}")
 
         # Recommendations
-        print("\n" + "=" * 80)
-        print("RECOMMENDATIONS")
-        print("=" * 80)
+        out.append("\n" + "=" * 80)
+        out.append("RECOMMENDATIONS")
+        out.append("=" * 80)
 
         if self.n < 500:
-            print("❌ Sample size too small for fine-tuning")
-            print(f"   Current: {self.n} | Recommended: 500-1000+ | Ideal: 2000+")
+            out.append("❌ Sample size too small for fine-tuning")
+            out.append(f"   Current: {self.n} | Recommended: 500-1000+ | Ideal: 2000+")
         elif self.n < 1000:
-            print("⚠️  Sample size on the low end")
-            print(f"   Current: {self.n} | Recommended: 1000+ for robust training")
+            out.append("⚠️  Sample size on the low end")
+            out.append(f"   Current: {self.n} | Recommended: 1000+ for robust training")
         else:
-            print("✅ Sample size adequate for fine-tuning")
+            out.append("✅ Sample size adequate for fine-tuning")
 
         if elem_analysis['avg_samples'] < 20:
-            print(f"⚠️  Only {elem_analysis['avg_samples']:.1f} samples per element combo")
-            print("   Recommend: 30-50+ samples per combination for good coverage")
+            out.append(f"⚠️  Only {elem_analysis['avg_samples']:.1f} samples per element combo")
+            out.append("   Recommend: 30-50+ samples per combination for good coverage")
 
         if elem_analysis['evenness_percent'] < 70:
-            print(f"⚠️  Uneven distribution ({elem_analysis['evenness_percent']:.1f}% evenness)")
-            print("   Some combinations are underrepresented - consider balancing")
+            out.append(f"⚠️  Uneven distribution ({elem_analysis['evenness_percent']:.1f}% evenness)")
+            out.append("   Some combinations are underrepresented - consider balancing")
 
         if action_analysis['sequence_diversity_percent'] < 80:
-            print(f"⚠️  Low sequence diversity ({action_analysis['sequence_diversity_percent']:.1f}%)")
-            print("   Consider adding more varied ability mechanics")
+            out.append(f"⚠️  Low sequence diversity ({action_analysis['sequence_diversity_percent']:.1f}%)")
+            out.append("   Consider adding more varied ability mechanics")
 
-        print("\n" + "=" * 80)
+        out.append("\n" + "=" * 80)
+
+        sys.stdout.write("\n".join(out) + "\n")
 
 def main():
     # Try to load fixed file first, fall back to original
@@ -380,8 +574,7 @@ def main():
 
     if fixed_file.exists():
         print(f"Loading: {fixed_file}\n")
-        with open(fixed_file, 'r') as f:
-            data = json.load(f)
+        data = load_json_file(fixed_file)
     else:
         print(f"Fixed file not found, attempting to load: {original_file}")
         print("(Run fix_training_data.py first for best results)\n")
@@ -390,30 +583,20 @@ def main():
         with open(original_file, 'r') as f:
             content = f.read()
 
-        # Quick and dirty extraction
-        import re
-        depth = 0
-        current_obj = ""
+        # Quick and dirty extraction: raw_decode each {...} block, skipping to the
+        # next '{' whenever a block fails to parse
+        decoder = json.JSONDecoder()
         data = []
-
-        for char in content:
-            if char == '{':
-                if depth == 0:
-                    current_obj = ""
-                depth += 1
-
-            if depth > 0:
-                current_obj += char
-
-            if char == '}':
-                depth -= 1
-                if depth == 0:
-                    try:
-                        obj = json.loads(current_obj)
-                        if 'name' in obj and 'ability' in obj:
-                            data.append(obj)
-                    except:
-                        pass
+        pos = content.find('{')
+        while pos != -1:
+            try:
+                obj, end = decoder.raw_decode(content, pos)
+            except json.JSONDecodeError:
+                pos = content.find('{', pos + 1)
+                continue
+            if 'name' in obj and 'ability' in obj:
+                data.append(obj)
+            pos = content.find('{', end)
 
     if not data:
         print("❌ No data loaded! Fix the JSON file first.")
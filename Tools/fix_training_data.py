@@ -8,45 +8,131 @@ import json
 import re
 from pathlib import Path
 
-def extract_json_objects(text):
-    """Extract individual JSON objects from malformed file."""
-    objects = []
-    # Pattern to match complete ability objects
-    # We look for objects that start with "name" field
-    pattern = r'\{\s*"name":\s*"([^"]+)"[^}]*?"ability":\s*\{.*?\n\s*\}\s*\}'
+try:
+    import orjson
+except ImportError:  # Optional: fall back to json.dump for output
+    orjson = None
 
-    # More robust: find all complete {...} blocks that contain "name" and "ability"
-    depth = 0
-    current_obj = ""
-    in_object = False
+# Matches a complete JSON string literal, including escaped quotes
+STRING_LITERAL = re.compile(r'"(?:\\.|[^"\\])*"')
 
-    for char in text:
-        if char == '{':
-            if depth == 0:
-                in_object = True
-                current_obj = ""
-            depth += 1
+def blank_string_literals(text):
+    """Replace the contents of string literals with spaces, keeping every offset intact."""
+    return STRING_LITERAL.sub(lambda m: '"' + ' ' * (len(m.group()) - 2) + '"', text)
 
-        if in_object:
-            current_obj += char
+def find_block_end(scan, start):
+    """Return the index just past the balanced {...} block opening at start, or -1.
 
-        if char == '}':
+    scan should come from blank_string_literals so braces inside strings are ignored.
+    Walks brace positions with str.find instead of testing every character.
+    """
+    depth = 0
+    next_open = scan.find('{', start)
+    next_close = scan.find('}', start)
+    while next_close != -1:
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            next_open = scan.find('{', next_open + 1)
+        else:
             depth -= 1
-            if depth == 0 and in_object:
-                in_object = False
-                # Try to parse this object
-                try:
-                    obj = json.loads(current_obj)
-                    # Validate it has required fields
-                    if 'name' in obj and 'ability' in obj:
-                        objects.append(obj)
-                        print(f"✓ Extracted: {obj['name']}")
-                except json.JSONDecodeError as e:
-                    print(f"✗ Failed to parse object (skipping): {str(e)[:50]}")
-                    continue
+            if depth == 0:
+                return next_close + 1
+            next_close = scan.find('}', next_close + 1)
+    return -1
+
+def next_sibling_start(text, pos):
+    """Return the offset of the next '{' that opens a line no deeper than the block at pos, or -1.
+
+    JSON strings can't contain raw newlines, so such a '{' always starts a new object
+    after the block at pos, even if that block is truncated or has an unterminated string.
+    """
+    line_start = text.rfind('\n', 0, pos) + 1
+    line = text[line_start:pos]
+    indent = len(line) - len(line.lstrip(' \t'))
+    match = re.compile(r'\n[ \t]{0,%d}\{' % indent).search(text, pos)
+    return match.end() - 1 if match else -1
+
+class NonFiniteFloat(float):
+    """NaN/Infinity parsed from the input (via parse_constant).
+
+    orjson would silently write these as null, but it refuses float subclasses, so
+    tagging them makes the orjson writer raise and fall back to json.dump, which
+    writes them back out as NaN/Infinity just like the input.
+    """
+
+def extract_json_objects(text):
+    """Extract individual JSON objects from malformed file."""
+    objects = []
+    decoder = json.JSONDecoder(parse_constant=NonFiniteFloat)
+
+    scan = None
+
+    # Decode each complete {...} block with raw_decode (scans in C rather than a
+    # per-character Python loop). On a parse error, skip past the broken block's
+    # closing brace so one bad object doesn't lose the rest of the file.
+    pos = text.find('{')
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError as e:
+            print(f"✗ Failed to parse object (skipping): {str(e)[:50]}")
+            if scan is None:
+                scan = blank_string_literals(text)
+            end = find_block_end(scan, pos)
+            limit = next_sibling_start(text, pos)
+            if end == -1 or (limit != -1 and end > limit):
+                # An unterminated string throws the blanked quote pairing out of sync,
+                # so the balance scan can't be trusted past the next object; resume there
+                end = limit if limit != -1 else pos + 1
+            pos = text.find('{', end)
+            continue
+
+        # Validate it has required fields
+        if 'name' in obj and 'ability' in obj:
+            objects.append(obj)
+            print(f"✓ Extracted: {obj['name']}")
+        pos = text.find('{', end)
 
     return objects
 
+def write_json_array(objects, f):
+    """Stream objects to a binary file as an indented JSON array using orjson.
+
+    Layout matches json.dump(objects, f, indent=2, ensure_ascii=False), but each object
+    is serialized and written on its own, so the whole indented document is never held
+    in memory. Floats use orjson's repr (1e-7 rather than json's 1e-07). Integers
+    beyond 64 bits and NonFiniteFloat values raise orjson.JSONEncodeError.
+    """
+    if not objects:
+        f.write(b'[]')
+        return
+
+    f.write(b'[\n')
+    for i, obj in enumerate(objects):
+        if i:
+            f.write(b',\n')
+        # Nest each object one level inside the array. Raw newlines only appear
+        # between tokens, since JSON escapes them inside strings.
+        dumped = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        f.write(b'  ' + dumped.replace(b'\n', b'\n  '))
+    f.write(b'\n]')
+
+def write_fixed_json(objects, path):
+    """Write objects as an indented JSON array, streaming with orjson when possible."""
+    if orjson is None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(objects, f, indent=2, ensure_ascii=False)
+        return
+
+    with open(path, 'wb') as f:
+        try:
+            write_json_array(objects, f)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits or NaN/Infinity; rewrite with the stdlib encoder
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(objects, indent=2, ensure_ascii=False).encode('utf-8'))
+
 def validate_ability(ability_obj):
     """Validate an ability object has required structure."""
     required_fields = ['name', 'description', 'color', 'ability']
@@ -101,8 +187,7 @@ def main():
 
     # Save fixed JSON
     print(f"Writing fixed JSON to: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(valid_objects, f, indent=2, ensure_ascii=False)
+    write_fixed_json(valid_objects, output_file)
 
     print(f"\n✅ Success! Wrote {len(valid_objects)} valid abilities")
     print(f"   Output: {output_file}")
@@ -0,0 +1,47 @@
+import copy
+
+import pytest
+
+import analyze_training_diversity
+from analyze_training_diversity import DiversityAnalyzer
+
+def entry(amount=10, args_extra=None):
+    args = {'amount': amount, 'element': 'fire'}
+    args.update(args_extra or {})
+    return {
+        'name': 'Test',
+        'ability': {
+            'primitives': ['fire', 'ice'],
+            'cooldown': 1.5,
+            'effects': [{'script': [{
+                'action': 'spawn_projectile',
+                'on_hit': [
+                    {'action': 'damage', 'args': args},
+                    {'action': 'apply_status', 'args': {'status': 'burning', 'duration': 3}},
+                ],
+            }]}],
+        },
+    }
+
+def test_identical_script_copies_share_one_walk(monkeypatch):
+    pytest.importorskip('orjson')
+    calls = []
+    visit = analyze_training_diversity._visit_script
+    monkeypatch.setattr(analyze_training_diversity, '_visit_script',
+                        lambda script, acc: calls.append(script) or visit(script, acc))
+
+    base = entry()
+    analyzer = DiversityAnalyzer([copy.deepcopy(base) for _ in range(3)])
+
+    assert analyzer.status_effects['distribution'] == {'burning': 3}
+    assert analyzer.parameters['damage']['avg'] == 10
+    assert analyzer.complexity['max_nesting_depth'] == 1
+    assert len(calls) < 3
+
+def test_int_beyond_64_bits():
+    stats = DiversityAnalyzer([entry(amount=10**20)]).analyze_parameters()
+    assert stats['damage']['max'] == 10**20
+
+def test_non_json_values_in_args():
+    analyzer = DiversityAnalyzer([entry(args_extra={'tags': {'a', 'b'}})])
+    assert analyzer.analyze_parameters()['damage']['min'] == 10
@@ -0,0 +1,36 @@
+import json
+
+from fix_training_data import extract_json_objects, write_fixed_json
+
+def good(name):
+    return '{"name": "%s", "ability": {"primitives": ["fire", "ice"]}}' % name
+
+def names(text):
+    return [obj['name'] for obj in extract_json_objects(text)]
+
+def test_extracts_every_object():
+    assert names('[\n' + good('A') + ',\n' + good('B') + '\n]') == ['A', 'B']
+
+def test_skips_object_with_unbalanced_brace():
+    text = good('A') + '\n{"name": "B", "ability": {broken}\n' + good('C')
+    assert names(text) == ['A', 'C']
+
+def test_unterminated_string_does_not_swallow_later_objects():
+    text = good('A') + '\n{"name": "B, "ability": {"x": 1}}\n' + good('C') + '\n' + good('D')
+    assert names(text) == ['A', 'C', 'D']
+
+def test_unterminated_string_in_indented_array():
+    text = '[\n  ' + good('A') + ',\n  {"name": "B, "ability": {"x": 1}},\n  ' + good('C') + '\n]'
+    assert names(text) == ['A', 'C']
+
+NON_FINITE = good('A') + '\n{"name": "B", "ability": {"cooldown": NaN, "range": -Infinity}}\n' + good('C')
+
+def test_non_finite_numbers_are_kept():
+    assert names(NON_FINITE) == ['A', 'B', 'C']
+
+def test_write_fixed_json_matches_json_dump(tmp_path):
+    objects = extract_json_objects(NON_FINITE)
+    objects.append({'name': 'D', 'ability': {'amount': 10**20}})
+    path = tmp_path / 'fixed.json'
+    write_fixed_json(objects, path)
+    assert path.read_text(encoding='utf-8') == json.dumps(objects, indent=2, ensure_ascii=False)